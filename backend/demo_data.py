@@ -6,9 +6,12 @@ Runs backend with in-memory storage for quick demo
 
 import asyncio
 import json
+from collections import Counter
 from datetime import datetime
 from typing import List, Dict
-import hashlib
+
+# Demo data is generated once at import, so a single timestamp is enough
+_NOW = datetime.utcnow().isoformat()
 
 # Mock data storage
 USERS = {}
@@ -16,12 +19,18 @@ TRIBES = []
 SHARED_FEEDS = []
 CONTENT_DB = []
 
+def attach_search_fields(item: Dict) -> Dict:
+    """Precompute lowered search text and token set for a content item"""
+    item["_search_text"] = f"{item['title']} {item['preview']} {' '.join(item['tags'])}".lower()
+    item["_search_tokens"] = frozenset(item["_search_text"].split())
+    return item
+
 # Sample content data
 def generate_sample_content():
     """Generate sample content for demo"""
     content = [
         {
-            "id": hashlib.md5("content1".encode()).hexdigest(),
+            "id": "7e55db001d319a94b0b713529a756623",  # md5("content1")
             "title": "Building a Startup in 2024: Lessons from Y Combinator",
             "url": "https://example.com/startup-lessons",
             "thumbnail": "https://via.placeholder.com/400x300/06D6A0/ffffff?text=Startup",
@@ -29,10 +38,10 @@ def generate_sample_content():
             "content_type": "article",
             "preview": "A comprehensive guide on building successful startups in the modern era...",
             "tags": ["startup", "business", "entrepreneurship"],
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": _NOW
         },
         {
-            "id": hashlib.md5("content2".encode()).hexdigest(),
+            "id": "eea670f4ac941df71a3b5f268ebe3eac",  # md5("content2")
             "title": "The Future of AI: GPT-4 and Beyond",
             "url": "https://example.com/ai-future",
             "thumbnail": "https://via.placeholder.com/400x300/FF6B6B/ffffff?text=AI",
@@ -40,10 +49,10 @@ def generate_sample_content():
             "content_type": "video",
             "preview": "Exploring the latest developments in artificial intelligence and machine learning...",
             "tags": ["AI", "technology", "machine-learning"],
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": _NOW
         },
         {
-            "id": hashlib.md5("content3".encode()).hexdigest(),
+            "id": "c96310e55d9677b978eae0dada47642c",  # md5("content3")
             "title": "React Performance Optimization: A Deep Dive",
             "url": "https://example.com/react-performance",
             "thumbnail": "https://via.placeholder.com/400x300/00D9FF/ffffff?text=React",
@@ -51,10 +60,10 @@ def generate_sample_content():
             "content_type": "repository",
             "preview": "Learn how to optimize React applications for maximum performance...",
             "tags": ["react", "javascript", "performance"],
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": _NOW
         },
         {
-            "id": hashlib.md5("content4".encode()).hexdigest(),
+            "id": "e22e815a116e7bdea9a59a87e63464a1",  # md5("content4")
             "title": "Product Management: From Idea to Launch",
             "url": "https://example.com/product-management",
             "thumbnail": "https://via.placeholder.com/400x300/06D6A0/ffffff?text=Product",
@@ -62,10 +71,10 @@ def generate_sample_content():
             "content_type": "article",
             "preview": "A practical guide to product management and launching successful products...",
             "tags": ["product", "management", "startup"],
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": _NOW
         },
         {
-            "id": hashlib.md5("content5".encode()).hexdigest(),
+            "id": "9fd5be8a5f880452b9d0c2cfced3e76a",  # md5("content5")
             "title": "The Tech Founder's Podcast: Episode 42",
             "url": "https://example.com/podcast-42",
             "thumbnail": None,
@@ -73,10 +82,10 @@ def generate_sample_content():
             "content_type": "audio",
             "preview": "Interview with successful tech founders about their journey...",
             "tags": ["podcast", "founder", "interview"],
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": _NOW
         },
         {
-            "id": hashlib.md5("content6".encode()).hexdigest(),
+            "id": "f4a40d590cbb53290e7ba914e24a346c",  # md5("content6")
             "title": "Minimalist Design: Less is More",
             "url": "https://example.com/minimalist-design",
             "thumbnail": "https://via.placeholder.com/400x300/FF6B6B/ffffff?text=Design",
@@ -84,10 +93,10 @@ def generate_sample_content():
             "content_type": "article",
             "preview": "Exploring the principles of minimalist design and how to apply them...",
             "tags": ["design", "minimalism", "UX"],
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": _NOW
         },
         {
-            "id": hashlib.md5("content7".encode()).hexdigest(),
+            "id": "13fc7746e9a3d7a6d674a73e51bf7124",  # md5("content7")
             "title": "Gen Z Startup Culture: What's Different?",
             "url": "https://example.com/genz-startup",
             "thumbnail": "https://via.placeholder.com/400x300/00D9FF/ffffff?text=GenZ",
@@ -95,10 +104,10 @@ def generate_sample_content():
             "content_type": "video",
             "preview": "How Gen Z is changing the startup landscape with new approaches...",
             "tags": ["genz", "startup", "culture"],
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": _NOW
         },
         {
-            "id": hashlib.md5("content8".encode()).hexdigest(),
+            "id": "f3e9bf80d3f012e4f099796936c855a4",  # md5("content8")
             "title": "Deep Work: How to Focus in a Distracted World",
             "url": "https://example.com/deep-work",
             "thumbnail": "https://via.placeholder.com/400x300/06D6A0/ffffff?text=Focus",
@@ -106,10 +115,10 @@ def generate_sample_content():
             "content_type": "article",
             "preview": "Strategies for maintaining focus and productivity in modern life...",
             "tags": ["productivity", "focus", "lifestyle"],
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": _NOW
         }
     ]
-    return content
+    return [attach_search_fields(item) for item in content]
 
 # Initialize sample data
 CONTENT_DB = generate_sample_content()
@@ -124,7 +133,7 @@ TRIBES = [
         "tags": ["builder", "indie", "vlog"],
         "creator_id": "demo_user",
         "followers": ["demo_user"],
-        "created_at": datetime.utcnow().isoformat()
+        "created_at": _NOW
     },
     {
         "id": "tribe2",
@@ -134,7 +143,7 @@ TRIBES = [
         "tags": ["AI", "research", "technology"],
         "creator_id": "demo_user",
         "followers": [],
-        "created_at": datetime.utcnow().isoformat()
+        "created_at": _NOW
     },
     {
         "id": "tribe3",
@@ -144,30 +153,46 @@ TRIBES = [
         "tags": ["product", "design", "UX"],
         "creator_id": "demo_user",
         "followers": [],
-        "created_at": datetime.utcnow().isoformat()
+        "created_at": _NOW
     }
 ]
 
+# Cached inverted index over content tokens (rebuilt on demand)
+_SEARCH_POSTINGS = None
+
+def build_search_index(content_db: List[Dict]) -> Dict[str, List[int]]:
+    """Build an inverted index mapping each token to the items containing it.
+
+    Tokens come from the precomputed `_search_tokens` set on each item, so
+    a query only touches the posting lists of its own tokens instead of
+    rescanning the whole catalog per keyword.
+    """
+    postings = {}
+    for idx, item in enumerate(content_db):
+        for token in item["_search_tokens"]:
+            postings.setdefault(token, []).append(idx)
+    return postings
+
+def invalidate_search_index():
+    """Drop the cached index so the next search rebuilds it"""
+    global _SEARCH_POSTINGS
+    _SEARCH_POSTINGS = None
+
 def simple_search(prompt: str, content_db: List[Dict]) -> List[Dict]:
-    """Simple keyword-based search for demo"""
-    prompt_lower = prompt.lower()
-    keywords = prompt_lower.split()
-    
-    results = []
-    for item in content_db:
-        score = 0
-        text = f"{item['title']} {item['preview']} {' '.join(item['tags'])}".lower()
-        
-        for keyword in keywords:
-            if keyword in text:
-                score += 1
-        
-        if score > 0:
-            results.append((score, item))
-    
-    # Sort by score and return top results
-    results.sort(key=lambda x: x[0], reverse=True)
-    return [item for score, item in results[:20]]
+    """Keyword search for demo, backed by the inverted index"""
+    global _SEARCH_POSTINGS
+    if _SEARCH_POSTINGS is None:
+        _SEARCH_POSTINGS = build_search_index(content_db)
+
+    # Counter.update over posting lists keeps the scoring loop in C
+    scores = Counter()
+    for token in set(prompt.lower().split()):
+        scores.update(_SEARCH_POSTINGS.get(token, ()))
+
+    return [content_db[idx] for idx, score in scores.most_common(20)]
+
+# Build the index once now that CONTENT_DB is populated
+_SEARCH_POSTINGS = build_search_index(CONTENT_DB)
 
 print("✅ TRIBED Demo Server Ready!")
 print(f"📊 Loaded {len(CONTENT_DB)} content items")
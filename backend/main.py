@@ -1,15 +1,17 @@
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from pydantic import BaseModel, EmailStr, Field
 from typing import List, Optional
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from time import time_ns
 from jose import JWTError, jwt
-from passlib.context import CryptContext
+import asyncio
+import bcrypt
 import os
 from bson import ObjectId
 import motor.motor_asyncio
-import json
 
 # Config
 SECRET_KEY = os.getenv("SECRET_KEY", "tribed-secret-key-change-in-production")
@@ -22,10 +24,10 @@ client = motor.motor_asyncio.AsyncIOMotorClient(MONGODB_URL)
 db = client.tribed
 
 # Security
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+BCRYPT_ROUNDS = 12
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-app = FastAPI(title="TRIBED API", version="1.0.0")
+app = FastAPI(title="TRIBED API", version="1.0.0", default_response_class=ORJSONResponse)
 
 # CORS
 app.add_middleware(
@@ -93,15 +95,20 @@ class ContentItem(BaseModel):
     created_at: datetime
 
 # Helper functions
+def _utcnow():
+    """Current UTC time via time_ns, which is a vDSO call and avoids the
+    allocation-heavy datetime.utcnow path on per-request code"""
+    return datetime.fromtimestamp(time_ns() / 1e9, tz=timezone.utc)
+
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return bcrypt.checkpw(plain_password.encode(), hashed_password.encode())
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode(), bcrypt.gensalt(BCRYPT_ROUNDS)).decode()
 
 def create_access_token(data: dict):
     to_encode = data.copy()
-    expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    expire = _utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
@@ -125,16 +132,30 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         raise credentials_exception
     return user
 
+@app.on_event("startup")
+async def create_db_indexes():
+    """Create the indexes backing the hot query and sort paths"""
+    await asyncio.gather(
+        db.users.create_index("email", unique=True),
+        db.users.create_index("username", unique=True),
+        db.tribes.create_index([("followers", -1)]),
+        db.shared_feeds.create_index("share_id", unique=True),
+        db.shared_feeds.create_index([("views", -1)])
+    )
+
 # Routes
 @app.get("/")
 async def root():
     return {"message": "TRIBED API v1.0", "status": "running"}
 
-@app.post("/register", response_model=Token)
+@app.post("/register")
 async def register(user: User):
-    # Check if user exists
-    existing = await db.users.find_one({"$or": [{"email": user.email}, {"username": user.username}]})
-    if existing:
+    # Check if user exists (two indexed lookups instead of an $or scan)
+    by_email, by_username = await asyncio.gather(
+        db.users.find_one({"email": user.email}),
+        db.users.find_one({"username": user.username})
+    )
+    if by_email or by_username:
         raise HTTPException(status_code=400, detail="User already exists")
     
     # Create user
@@ -142,7 +163,7 @@ async def register(user: User):
         "email": user.email,
         "username": user.username,
         "hashed_password": get_password_hash(user.password),
-        "created_at": datetime.utcnow(),
+        "created_at": _utcnow(),
         "saved_prompts": [],
         "followed_tribes": [],
         "shared_feeds": []
@@ -154,7 +175,7 @@ async def register(user: User):
     access_token = create_access_token(data={"sub": user.email})
     return {"access_token": access_token, "token_type": "bearer"}
 
-@app.post("/token", response_model=Token)
+@app.post("/token")
 async def login(form_data: OAuth2PasswordRequestForm = Depends()):
     user = await db.users.find_one({"email": form_data.username})
     if not user or not verify_password(form_data.password, user["hashed_password"]):
@@ -186,12 +207,11 @@ async def generate_feed(feed_prompt: FeedPrompt, current_user: dict = Depends(ge
     # Generate feed using ML engine
     feed_items = await generate_feed_from_prompt(feed_prompt.prompt, feed_prompt.filters)
     
-    # Save prompt to user history
-    if feed_prompt.prompt not in current_user.get("saved_prompts", []):
-        await db.users.update_one(
-            {"_id": current_user["_id"]},
-            {"$push": {"saved_prompts": feed_prompt.prompt}}
-        )
+    # Save prompt to user history ($addToSet dedups server-side)
+    await db.users.update_one(
+        {"_id": current_user["_id"]},
+        {"$addToSet": {"saved_prompts": feed_prompt.prompt}}
+    )
     
     return {"items": feed_items, "count": len(feed_items)}
 
@@ -223,7 +243,7 @@ async def create_tribe(tribe: Tribe, current_user: dict = Depends(get_current_us
         "tags": tribe.tags,
         "creator_id": current_user["_id"],
         "followers": [str(current_user["_id"])],
-        "created_at": datetime.utcnow()
+        "created_at": _utcnow()
     }
     
     result = await db.tribes.insert_one(tribe_dict)
@@ -239,43 +259,41 @@ async def create_tribe(tribe: Tribe, current_user: dict = Depends(get_current_us
 @app.post("/tribes/{tribe_id}/follow")
 async def follow_tribe(tribe_id: str, current_user: dict = Depends(get_current_user)):
     """Follow a tribe"""
-    tribe = await db.tribes.find_one({"_id": ObjectId(tribe_id)})
+    user_id_str = str(current_user["_id"])
+
+    # $addToSet is idempotent, so no membership pre-check is needed and the
+    # existence check rides along with the update
+    tribe = await db.tribes.find_one_and_update(
+        {"_id": ObjectId(tribe_id)},
+        {"$addToSet": {"followers": user_id_str}}
+    )
     if not tribe:
         raise HTTPException(status_code=404, detail="Tribe not found")
-    
-    user_id_str = str(current_user["_id"])
-    
-    # Add user to tribe followers
-    if user_id_str not in tribe.get("followers", []):
-        await db.tribes.update_one(
-            {"_id": ObjectId(tribe_id)},
-            {"$push": {"followers": user_id_str}}
-        )
-    
-    # Add tribe to user's followed tribes
-    if tribe_id not in current_user.get("followed_tribes", []):
-        await db.users.update_one(
-            {"_id": current_user["_id"]},
-            {"$push": {"followed_tribes": tribe_id}}
-        )
-    
+
+    await db.users.update_one(
+        {"_id": current_user["_id"]},
+        {"$addToSet": {"followed_tribes": tribe_id}}
+    )
+
     return {"message": "Tribe followed successfully"}
 
 @app.post("/tribes/{tribe_id}/unfollow")
 async def unfollow_tribe(tribe_id: str, current_user: dict = Depends(get_current_user)):
     """Unfollow a tribe"""
     user_id_str = str(current_user["_id"])
-    
-    await db.tribes.update_one(
-        {"_id": ObjectId(tribe_id)},
-        {"$pull": {"followers": user_id_str}}
-    )
-    
-    await db.users.update_one(
-        {"_id": current_user["_id"]},
-        {"$pull": {"followed_tribes": tribe_id}}
+
+    # The two $pull updates are independent, so issue them concurrently
+    await asyncio.gather(
+        db.tribes.update_one(
+            {"_id": ObjectId(tribe_id)},
+            {"$pull": {"followers": user_id_str}}
+        ),
+        db.users.update_one(
+            {"_id": current_user["_id"]},
+            {"$pull": {"followed_tribes": tribe_id}}
+        )
     )
-    
+
     return {"message": "Tribe unfollowed successfully"}
 
 @app.get("/tribes/{tribe_id}/feed")
@@ -305,7 +323,7 @@ async def share_feed(shared_feed: SharedFeed, current_user: dict = Depends(get_c
         "creator_id": str(current_user["_id"]),
         "creator_username": current_user["username"],
         "views": 0,
-        "created_at": datetime.utcnow()
+        "created_at": _utcnow()
     }
     
     result = await db.shared_feeds.insert_one(feed_dict)
@@ -0,0 +1,65 @@
+"""Hot per-item helpers for the scrapers, isolated for AOT compilation.
+
+Everything here is a pure, fully annotated function with no async, no
+closures and no module-level state, so the whole file can be compiled
+as-is with mypyc (`mypyc scrapers/_fast.py`) or Cython for a 2-4x win
+on the dict-building loops. Without a compiled extension it runs as
+plain Python with identical behavior.
+"""
+
+import time
+from hashlib import blake2b
+from typing import Any, Dict, List
+
+def fp(s: str) -> str:
+    """128-bit content fingerprint; blake2b beats md5 on short inputs"""
+    return blake2b(s.encode(), digest_size=16).hexdigest()
+
+def iso_utc(ts: float) -> str:
+    """Format an epoch timestamp as ISO-8601 UTC without a datetime allocation"""
+    t = time.gmtime(ts)
+    return f"{t.tm_year:04d}-{t.tm_mon:02d}-{t.tm_mday:02d}T{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}"
+
+def build_reddit_item(d: Any, tags: List[str]) -> Dict[str, Any]:
+    """Build a content item from a Reddit post's lazily-parsed data node"""
+    thumb = str(d.get("thumbnail") or "")
+    return {
+        "id": fp(str(d.get("url") or "")),
+        "title": str(d.get("title") or ""),
+        "url": f"https://www.reddit.com{d.get('permalink') or ''}",
+        "thumbnail": thumb if thumb.startswith(("http://", "https://")) else None,
+        "source": "reddit",
+        "content_type": "video" if d.get("is_video") else "text",
+        "preview": str(d.get("selftext") or "")[:500],
+        "tags": tags,
+        "created_at": iso_utc(d.get("created_utc") or 0)
+    }
+
+def build_medium_item(article_url: str, title: str, preview: str,
+                      tags: List[str], now_iso: str) -> Dict[str, Any]:
+    """Build a content item from an already-extracted Medium article"""
+    return {
+        "id": fp(article_url),
+        "title": title,
+        "url": article_url,
+        "thumbnail": None,
+        "source": "medium",
+        "content_type": "article",
+        "preview": preview[:500],
+        "tags": tags,
+        "created_at": now_iso
+    }
+
+def build_github_item(repo: Dict[str, Any], tags: List[str], now_iso: str) -> Dict[str, Any]:
+    """Build a content item from a GitHub search-API repository entry"""
+    return {
+        "id": fp(repo.get("html_url", "")),
+        "title": repo.get("full_name", ""),
+        "url": repo.get("html_url", ""),
+        "thumbnail": repo.get("owner", {}).get("avatar_url"),
+        "source": "github",
+        "content_type": "repository",
+        "preview": (repo.get("description") or "")[:500],
+        "tags": tags,
+        "created_at": repo.get("created_at", now_iso)
+    }
@@ -1,75 +1,215 @@
 import requests
-from bs4 import BeautifulSoup
-import feedparser
+import lxml.html
+from lxml import etree
+import fastfeedparser
 import asyncio
 import httpx
+import orjson
+import simdjson
 from typing import List, Dict
+from urllib.parse import urljoin, urlsplit
 from datetime import datetime
-import hashlib
+import functools
 import re
+import time
+
+from _fast import (
+    fp as _fp,
+    build_github_item,
+    build_medium_item,
+    build_reddit_item,
+)
+
+# How long scrape results stay fresh before a source is re-fetched
+SCRAPE_CACHE_TTL = 300  # seconds
+
+# Per-host concurrency caps so parallel scrape tasks don't hammer one origin
+HOST_LIMITS = {"www.reddit.com": 2, "medium.com": 2, "api.github.com": 3}
+FETCH_RETRIES = 3
+
+# Fields every scraper emits per content item, in column order
+ITEM_FIELDS = (
+    "id", "title", "url", "thumbnail", "source",
+    "content_type", "preview", "tags", "created_at"
+)
+
+def _ttl_cached(func):
+    """Memoize an async scrape method per (method, args) for SCRAPE_CACHE_TTL.
+
+    Scheduled runs hit the same handful of endpoints over and over;
+    within the TTL they get the memoized list back instead of burning
+    bandwidth and rate-limit quota. Empty results are never cached: the
+    scrape methods swallow errors and return [], and memoizing that
+    would blank a source for the whole TTL after one transient failure.
+    """
+    @functools.wraps(func)
+    async def wrapper(self, *args, **kwargs):
+        key = (func.__name__, args, tuple(sorted(kwargs.items())))
+        now = time.monotonic()
+        hit = self._cache.get(key)
+        if hit is not None and now - hit[0] < SCRAPE_CACHE_TTL:
+            return hit[1]
+
+        items = await func(self, *args, **kwargs)
+        if items:
+            self._cache[key] = (now, items)
+        return items
+    return wrapper
+
+@functools.lru_cache(maxsize=64)
+def _fake_podcasts(term: str, limit: int) -> tuple:
+    """Build the simulated podcast items for a term, memoized per (term, limit).
+
+    The data is deterministic, so the hashing and string formatting only
+    ever run once per search term instead of on every scrape_all pass.
+    """
+    items = []
+    for i in range(min(limit, 10)):
+        content_id = _fp(f"podcast_{term}_{i}")
+        items.append({
+            "id": content_id,
+            "title": f"Podcast Episode: {term.title()} Insights #{i+1}",
+            "url": f"https://example.com/podcast/{content_id}",
+            "thumbnail": None,
+            "source": "podcast",
+            "content_type": "audio",
+            "preview": f"Deep dive into {term} with industry experts. Covering latest trends and insights.",
+            "tags": [term, "podcast", "audio"],
+        })
+    return tuple(items)
 
 class ContentScraper:
+    # Precompiled XPaths so each Medium article is traversed once in libxml2
+    _ARTICLE_XPATH = etree.XPath('//article')
+    _TITLE_XPATH = etree.XPath('.//h2//text() | .//h3//text()')
+    _HREF_XPATH = etree.XPath('.//a/@href')
+    _PREVIEW_XPATH = etree.XPath('.//p//text()')
+
     def __init__(self):
         self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
+            # Advertise brotli on top of httpx's default gzip/deflate;
+            # Reddit/GitHub JSON compresses ~8x, so wire bytes drop a lot
+            'Accept-Encoding': 'br, gzip, deflate'
         }
-    
+        # One long-lived client so all scrapers share pooled keep-alive
+        # connections (and HTTP/2 multiplexing) instead of paying a TCP+TLS
+        # handshake per request
+        self.client = httpx.AsyncClient(
+            http2=True,
+            headers=self.headers,
+            timeout=10,
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=50)
+        )
+        self._cache = {}
+        self._host_sems = {}
+        # Reused across calls so simdjson recycles its internal tape buffer
+        self._json_parser = simdjson.Parser()
+
+    def _host_sem(self, host: str) -> asyncio.Semaphore:
+        sem = self._host_sems.get(host)
+        if sem is None:
+            sem = self._host_sems[host] = asyncio.Semaphore(HOST_LIMITS.get(host, 4))
+        return sem
+
+    async def _get(self, url: str) -> httpx.Response:
+        """GET with a per-host concurrency cap and retry-with-backoff.
+
+        Concurrent tasks for the same host queue on its semaphore instead
+        of all firing at once, and a 429/5xx answer is retried with
+        exponential backoff rather than losing the whole batch.
+        """
+        async with self._host_sem(urlsplit(url).netloc):
+            for attempt in range(FETCH_RETRIES):
+                last = attempt + 1 == FETCH_RETRIES
+                try:
+                    response = await self.client.get(url)
+                except httpx.TransportError:
+                    # Connect failures and timeouts are as transient as a
+                    # 503, so they get the same backoff
+                    if last:
+                        raise
+                else:
+                    status = response.status_code
+                    if status < 400:
+                        return response
+                    # Only rate limits and server errors are worth
+                    # retrying; a 401/403/404 won't change on attempt two
+                    if last or (status != 429 and status < 500):
+                        response.raise_for_status()
+                await asyncio.sleep(2 ** attempt)
+
+    async def aclose(self):
+        await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+
+    @_ttl_cached
     async def scrape_reddit(self, subreddit: str = "all", limit: int = 50) -> List[Dict]:
         """Scrape Reddit public posts (JSON API, no auth needed)"""
         url = f"https://www.reddit.com/r/{subreddit}/hot.json?limit={limit}"
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=self.headers, timeout=10)
-                data = response.json()
-                
-                content_items = []
-                for post in data.get("data", {}).get("children", []):
-                    post_data = post.get("data", {})
-                    
-                    content_id = hashlib.md5(post_data.get("url", "").encode()).hexdigest()
-                    
-                    item = {
-                        "id": content_id,
-                        "title": post_data.get("title", ""),
-                        "url": f"https://www.reddit.com{post_data.get('permalink', '')}",
-                        "thumbnail": post_data.get("thumbnail") if post_data.get("thumbnail", "").startswith("http") else None,
-                        "source": "reddit",
-                        "content_type": "text" if not post_data.get("is_video") else "video",
-                        "preview": post_data.get("selftext", "")[:500],
-                        "tags": [subreddit, "community"],
-                        "created_at": datetime.fromtimestamp(post_data.get("created_utc", 0)).isoformat()
-                    }
-                    content_items.append(item)
-                
-                return content_items
+            response = await self._get(url)
+            # Lazy simdjson parse: only the ~8 fields we keep per post get
+            # materialized as Python objects, not the dozens Reddit returns.
+            # No awaits between parse() and the loop below, so the shared
+            # parser's tape is safe to reuse across concurrent tasks.
+            doc = self._json_parser.parse(response.content)
+            children = doc.get("data", {}).get("children", [])
+
+            tags = [subreddit, "community"]
+
+            items = []
+            for child in children:
+                items.append(build_reddit_item(child["data"], tags))
+            return items
         except Exception as e:
             print(f"Reddit scraping error: {e}")
             return []
     
+    @_ttl_cached
     async def scrape_youtube_rss(self, channel_id: str = None, query: str = None) -> List[Dict]:
         """Scrape YouTube via RSS feeds (no API key needed)"""
         content_items = []
         
         try:
             if channel_id:
-                # Channel RSS feed
+                # Channel RSS feed, fetched on the shared client and parsed
+                # with the lxml-backed parser so the event loop isn't blocked
+                # by feedparser's synchronous fetch
                 rss_url = f"https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}"
-                feed = feedparser.parse(rss_url)
-                
+                response = await self._get(rss_url)
+                feed = await asyncio.to_thread(fastfeedparser.parse, response.text)
+
+                # One "now" stamp per scrape is plenty for fallback dates
+                now_iso = datetime.utcnow().isoformat()
                 for entry in feed.entries[:20]:
-                    content_id = hashlib.md5(entry.link.encode()).hexdigest()
-                    
+                    content_id = _fp(entry.link)
+                    # fastfeedparser folds media:group into media_content:
+                    # the description lands there, media_content["url"] is
+                    # the embed player (not an image), and media:thumbnail
+                    # is dropped — so derive the image from the video id
+                    media = entry.get("media_content", [{}])[0]
+                    _, sep, video_id = entry.link.rpartition("v=")
+                    thumbnail = media.get("thumbnail_url") or (
+                        f"https://i.ytimg.com/vi/{video_id}/hqdefault.jpg" if sep else None
+                    )
+
                     item = {
                         "id": content_id,
                         "title": entry.title,
                         "url": entry.link,
-                        "thumbnail": entry.get("media_thumbnail", [{}])[0].get("url") if "media_thumbnail" in entry else None,
+                        "thumbnail": thumbnail,
                         "source": "youtube",
                         "content_type": "video",
-                        "preview": entry.get("summary", "")[:500],
+                        "preview": media.get("description", "")[:500],
                         "tags": ["video", "youtube"],
-                        "created_at": entry.get("published", datetime.utcnow().isoformat())
+                        "created_at": entry.get("published", now_iso)
                     }
                     content_items.append(item)
         except Exception as e:
@@ -77,114 +217,68 @@ class ContentScraper:
         
         return content_items
     
+    @_ttl_cached
     async def scrape_medium(self, tag: str = "technology", limit: int = 30) -> List[Dict]:
         """Scrape Medium public articles"""
         url = f"https://medium.com/tag/{tag}"
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=self.headers, timeout=10)
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                content_items = []
-                articles = soup.find_all('article', limit=limit)
-                
-                for article in articles:
-                    try:
-                        title_elem = article.find('h2') or article.find('h3')
-                        if not title_elem:
-                            continue
-                        
-                        title = title_elem.get_text(strip=True)
-                        
-                        link_elem = article.find('a', href=True)
-                        if not link_elem:
-                            continue
-                        
-                        url = link_elem['href']
-                        if url.startswith('/'):
-                            url = f"https://medium.com{url}"
-                        
-                        content_id = hashlib.md5(url.encode()).hexdigest()
-                        
-                        preview_elem = article.find('p')
-                        preview = preview_elem.get_text(strip=True) if preview_elem else ""
-                        
-                        item = {
-                            "id": content_id,
-                            "title": title,
-                            "url": url,
-                            "thumbnail": None,
-                            "source": "medium",
-                            "content_type": "article",
-                            "preview": preview[:500],
-                            "tags": [tag, "article", "blog"],
-                            "created_at": datetime.utcnow().isoformat()
-                        }
-                        content_items.append(item)
-                    except Exception as e:
-                        continue
-                
-                return content_items
+            response = await self._get(url)
+            # HTML parsing is CPU-bound, so keep it off the event loop
+            doc = await asyncio.to_thread(lxml.html.fromstring, response.text)
+
+            content_items = []
+            now_iso = datetime.utcnow().isoformat()
+            tags = [tag, "article", "blog"]
+            # Explicit guards beat a try/except per article: articles missing
+            # a title or link just fall through, no exception machinery
+            for article in self._ARTICLE_XPATH(doc)[:limit]:
+                titles = self._TITLE_XPATH(article)
+                if not titles:
+                    continue
+                # Join all text nodes: inline markup (<em>, links) splits a
+                # headline across several fragments
+                title = "".join(titles).strip()
+
+                hrefs = self._HREF_XPATH(article)
+                if not hrefs:
+                    continue
+
+                article_url = urljoin("https://medium.com/", hrefs[0])
+                preview = "".join(self._PREVIEW_XPATH(article)).strip()
+                content_items.append(
+                    build_medium_item(article_url, title, preview, tags, now_iso)
+                )
+
+            return content_items
         except Exception as e:
             print(f"Medium scraping error: {e}")
             return []
     
+    @_ttl_cached
     async def scrape_podcasts(self, term: str = "technology", limit: int = 20) -> List[Dict]:
         """Scrape podcasts from PodcastIndex API (free)"""
         # Note: In production, use actual PodcastIndex API with key
-        # For demo, we'll simulate podcast data
-        content_items = []
-        
-        try:
-            # Simulate podcast results
-            for i in range(min(limit, 10)):
-                content_id = hashlib.md5(f"podcast_{term}_{i}".encode()).hexdigest()
-                
-                item = {
-                    "id": content_id,
-                    "title": f"Podcast Episode: {term.title()} Insights #{i+1}",
-                    "url": f"https://example.com/podcast/{content_id}",
-                    "thumbnail": None,
-                    "source": "podcast",
-                    "content_type": "audio",
-                    "preview": f"Deep dive into {term} with industry experts. Covering latest trends and insights.",
-                    "tags": [term, "podcast", "audio"],
-                    "created_at": datetime.utcnow().isoformat()
-                }
-                content_items.append(item)
-        except Exception as e:
-            print(f"Podcast scraping error: {e}")
-        
-        return content_items
+        # For demo, we reuse the memoized simulated items with a fresh stamp
+        now_iso = datetime.utcnow().isoformat()
+        return [{**item, "created_at": now_iso} for item in _fake_podcasts(term, limit)]
     
+    @_ttl_cached
     async def scrape_github_repos(self, topic: str = "machine-learning", limit: int = 20) -> List[Dict]:
         """Scrape trending GitHub repositories"""
         url = f"https://api.github.com/search/repositories?q=topic:{topic}&sort=stars&order=desc&per_page={limit}"
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(url, headers=self.headers, timeout=10)
-                data = response.json()
-                
-                content_items = []
-                for repo in data.get("items", []):
-                    content_id = hashlib.md5(repo.get("html_url", "").encode()).hexdigest()
-                    
-                    item = {
-                        "id": content_id,
-                        "title": repo.get("full_name", ""),
-                        "url": repo.get("html_url", ""),
-                        "thumbnail": repo.get("owner", {}).get("avatar_url"),
-                        "source": "github",
-                        "content_type": "repository",
-                        "preview": repo.get("description", "")[:500],
-                        "tags": [topic, "code", "github", "opensource"],
-                        "created_at": repo.get("created_at", datetime.utcnow().isoformat())
-                    }
-                    content_items.append(item)
-                
-                return content_items
+            response = await self._get(url)
+            data = orjson.loads(response.content)
+            
+            content_items = []
+            now_iso = datetime.utcnow().isoformat()
+            tags = [topic, "code", "github", "opensource"]
+            for repo in data.get("items", []):
+                content_items.append(build_github_item(repo, tags, now_iso))
+            
+            return content_items
         except Exception as e:
             print(f"GitHub scraping error: {e}")
             return []
@@ -208,19 +302,34 @@ class ContentScraper:
         ]
         
         results = await asyncio.gather(*tasks, return_exceptions=True)
-        
+
+        # Drop cross-source duplicates (same URL fingerprint) in one pass
+        seen = set()
         for result in results:
             if isinstance(result, list):
-                all_content.extend(result)
-        
+                for item in result:
+                    if item["id"] not in seen:
+                        seen.add(item["id"])
+                        all_content.append(item)
+
         return all_content
 
+    async def scrape_all_soa(self) -> Dict[str, list]:
+        """Scrape all sources and pivot the items into per-field columns.
+
+        Returns a dict of parallel lists keyed by ITEM_FIELDS, so batch
+        consumers (embedding, tagging, dedup) can hand a whole column to
+        a vectorized step instead of pulling keys out of each dict.
+        """
+        items = await self.scrape_all()
+        return {field: [item[field] for item in items] for field in ITEM_FIELDS}
+
 # Standalone scraper runner
 async def run_scraper():
-    scraper = ContentScraper()
-    print("Starting content scraper...")
-    
-    content = await scraper.scrape_all()
+    async with ContentScraper() as scraper:
+        print("Starting content scraper...")
+
+        content = await scraper.scrape_all()
     print(f"Scraped {len(content)} content items")
     
     # Import ML service and add content
@@ -232,4 +341,8 @@ async def run_scraper():
     print("Content added to ML engine")
 
 if __name__ == "__main__":
+    # libuv event loop: ~2x faster than the default selector loop for
+    # many-concurrent-HTTP workloads like scrape_all
+    import uvloop
+    uvloop.install()
     asyncio.run(run_scraper())